@@ -283,6 +283,12 @@ max_internal_user_budget: Optional[float] = None
 internal_user_budget_duration: Optional[str] = None
 max_end_user_budget: Optional[float] = None
 disable_end_user_cost_tracking: Optional[bool] = None
+approximate_rate_limits: bool = (
+    False  # if True, proxy rate limits skip loading missing usage from redis, and sync with redis every 1s instead of every batch window. Limits are approximate across instances either way.
+)
+rate_limit_redis_batch_window_ms: Optional[int] = (
+    None  # how often proxy rate limit usage is pushed to redis, in ms. Defaults to 5ms
+)
 #### REQUEST PRIORITIZATION ####
 priority_reservation: Optional[Dict[str, float]] = None
 #### RELIABILITY ####
@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
 import litellm
 from litellm._logging import print_verbose, verbose_logger
+from litellm.types.caching import DictIncrementOperation
 
 from .base_cache import BaseCache
 from .in_memory_cache import InMemoryCache
@@ -373,6 +374,35 @@ class DualCache(BaseCache):
         except Exception as e:
             raise e  # don't log if exception is raised
 
+    async def async_increment_dict_pipeline(
+        self,
+        increment_list: List[DictIncrementOperation],
+        parent_otel_span: Optional[Span] = None,
+        local_only: bool = False,
+        **kwargs,
+    ) -> Optional[List[dict]]:
+        """
+        Atomically increment the counters in the dict stored at each key
+
+        Returns - List[dict] - the incremented dicts
+        """
+        try:
+            result: Optional[List[dict]] = None
+            if self.in_memory_cache is not None:
+                result = await self.in_memory_cache.async_increment_dict_pipeline(
+                    increment_list=increment_list
+                )
+
+            if self.redis_cache is not None and local_only is False:
+                result = await self.redis_cache.async_increment_dict_pipeline(
+                    increment_list=increment_list,
+                    parent_otel_span=parent_otel_span,
+                )
+
+            return result
+        except Exception as e:
+            raise e  # don't log if exception is raised
+
     async def async_set_cache_sadd(
         self, key, value: List, local_only: bool = False, **kwargs
     ) -> None:
@@ -12,6 +12,8 @@ import json
 import time
 from typing import List, Optional
 
+from litellm.types.caching import DictIncrementOperation
+
 from .base_cache import BaseCache
 
 
@@ -96,6 +98,9 @@ class InMemoryCache(BaseCache):
                     self.cache_dict.pop(key, None)
                     return None
             original_cached_response = self.cache_dict[key]
+            if not isinstance(original_cached_response, (str, bytes, bytearray)):
+                # only strings can be json - skip the raised + caught TypeError for dicts / ints (e.g. rate limit counters)
+                return original_cached_response
             try:
                 cached_response = json.loads(original_cached_response)
             except Exception:
@@ -135,6 +140,30 @@ class InMemoryCache(BaseCache):
 
         return value
 
+    async def async_increment_dict_pipeline(
+        self, increment_list: List[DictIncrementOperation], **kwargs
+    ) -> List[dict]:
+        """
+        Increment the counters in the dict stored at each key. Counters never go below 0.
+
+        - ttl is only set when the key is created
+        - there's no await in here, so the read + write of a key can't interleave with other coroutines
+        """
+        results = []
+        for increment_op in increment_list:
+            key = increment_op["key"]
+            current = self.get_cache(key=key)
+            new_value = dict(current) if isinstance(current, dict) else {}
+            for field, value in increment_op["increments"].items():
+                new_value[field] = max(new_value.get(field, 0) + value, 0)
+
+            if current is not None and key in self.ttl_dict:
+                self.cache_dict[key] = new_value
+            else:
+                self.set_cache(key, new_value, ttl=increment_op["ttl"])
+            results.append(new_value)
+        return results
+
     def flush_cache(self):
         self.cache_dict.clear()
         self.ttl_dict.clear()
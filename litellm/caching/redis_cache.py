@@ -20,7 +20,10 @@ from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 import litellm
 from litellm._logging import print_verbose, verbose_logger
 from litellm.litellm_core_utils.core_helpers import _get_parent_otel_span_from_kwargs
-from litellm.types.caching import RedisPipelineIncrementOperation
+from litellm.types.caching import (
+    DictIncrementOperation,
+    RedisPipelineIncrementOperation,
+)
 from litellm.types.services import ServiceLoggerPayload, ServiceTypes
 from litellm.types.utils import all_litellm_params
 
@@ -39,6 +42,35 @@ else:
     async_redis_client = Any
     Span = Any
 
+# Atomically increments the counters in a dict stored as a json string
+# KEYS[1] - key of the dict
+# ARGV[1] - ttl in seconds, only set when the key is created. 0 for no ttl
+# ARGV[2..n] - field, increment pairs. Counters never go below 0
+INCREMENT_DICT_LUA_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+local counters = {}
+if current then
+    counters = cjson.decode(current)
+end
+for i = 2, #ARGV, 2 do
+    local value = (tonumber(counters[ARGV[i]]) or 0) + tonumber(ARGV[i + 1])
+    if value < 0 then
+        value = 0
+    end
+    counters[ARGV[i]] = value
+end
+local encoded = cjson.encode(counters)
+local pttl = redis.call('PTTL', KEYS[1])
+if pttl > 0 then
+    redis.call('SET', KEYS[1], encoded, 'PX', pttl)
+elseif current == false and tonumber(ARGV[1]) > 0 then
+    redis.call('SET', KEYS[1], encoded, 'EX', ARGV[1])
+else
+    redis.call('SET', KEYS[1], encoded)
+end
+return encoded
+"""
+
 
 class RedisCache(BaseCache):
     # if users don't provider one, use the default litellm cache
@@ -980,3 +1012,92 @@ class RedisCache(BaseCache):
                 str(e),
             )
             raise e
+
+    async def _pipeline_increment_dict_helper(
+        self,
+        redis_client: async_redis_client,
+        pipe: pipeline,
+        increment_list: List[DictIncrementOperation],
+    ) -> List[dict]:
+        """Helper function for pipeline dict increment operations"""
+        increment_dict_script = redis_client.register_script(INCREMENT_DICT_LUA_SCRIPT)
+        for increment_op in increment_list:
+            cache_key = self.check_and_fix_namespace(key=increment_op["key"])
+            args: List[Any] = [increment_op["ttl"] or 0]
+            for field, value in increment_op["increments"].items():
+                args.extend([field, value])
+            await increment_dict_script(keys=[cache_key], args=args, client=pipe)
+        results = await pipe.execute()
+        print_verbose(f"Increment Dict ASYNC Redis Cache PIPELINE: results: {results}")
+        return [self._get_cache_logic(result) for result in results]
+
+    async def async_increment_dict_pipeline(
+        self,
+        increment_list: List[DictIncrementOperation],
+        parent_otel_span: Optional[Span] = None,
+    ) -> Optional[List[dict]]:
+        """
+        Use Redis Pipelines to atomically increment the counters in a dict stored at each key
+
+        Each increment runs as a lua script, so concurrent increments from multiple instances are never lost.
+
+        Args:
+            increment_list: List of DictIncrementOperation dicts containing:
+                - key: str
+                - increments: Dict[str, int]
+                - ttl: Optional[int]
+        """
+        # don't waste a network request if there's nothing to increment
+        if len(increment_list) == 0:
+            return None
+
+        from redis.asyncio import Redis
+
+        _redis_client: Redis = self.init_async_client()  # type: ignore
+        start_time = time.time()
+
+        print_verbose(
+            f"Increment Dict Async Redis Cache Pipeline: increment list: {increment_list}"
+        )
+
+        try:
+            async with _redis_client as redis_client:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    results = await self._pipeline_increment_dict_helper(
+                        redis_client, pipe, increment_list
+                    )
+
+            ## LOGGING ##
+            end_time = time.time()
+            _duration = end_time - start_time
+            asyncio.create_task(
+                self.service_logger_obj.async_service_success_hook(
+                    service=ServiceTypes.REDIS,
+                    duration=_duration,
+                    call_type="async_increment_dict_pipeline",
+                    start_time=start_time,
+                    end_time=end_time,
+                    parent_otel_span=parent_otel_span,
+                )
+            )
+            return results
+        except Exception as e:
+            ## LOGGING ##
+            end_time = time.time()
+            _duration = end_time - start_time
+            asyncio.create_task(
+                self.service_logger_obj.async_service_failure_hook(
+                    service=ServiceTypes.REDIS,
+                    duration=_duration,
+                    error=e,
+                    call_type="async_increment_dict_pipeline",
+                    start_time=start_time,
+                    end_time=end_time,
+                    parent_otel_span=parent_otel_span,
+                )
+            )
+            verbose_logger.error(
+                "LiteLLM Redis Caching: async increment_dict_pipeline() - Got exception from REDIS %s",
+                str(e),
+            )
+            raise e
@@ -1,8 +1,18 @@
 import asyncio
-import sys
+import time
 import traceback
-from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, List, Literal, Optional, Tuple, TypedDict, Union
+from datetime import datetime
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Union,
+    cast,
+)
 
 from fastapi import HTTPException
 from pydantic import BaseModel
@@ -17,6 +27,7 @@ from litellm.proxy.auth.auth_utils import (
     get_key_model_rpm_limit,
     get_key_model_tpm_limit,
 )
+from litellm.types.caching import DictIncrementOperation
 
 if TYPE_CHECKING:
     from opentelemetry.trace import Span as _Span
@@ -30,26 +41,136 @@ else:
     InternalUsageCache = Any
 
 
-class CacheObject(TypedDict):
-    current_global_requests: Optional[dict]
-    request_count_api_key: Optional[dict]
-    request_count_user_id: Optional[dict]
-    request_count_team_id: Optional[dict]
-    request_count_end_user_id: Optional[dict]
+DEFAULT_REDIS_BATCH_WINDOW_MS = 5
+DEFAULT_REDIS_SYNC_INTERVAL = 1  # used when `litellm.approximate_rate_limits` is True
+
+
+def _has_key_model_limit(
+    tpm_limit_for_key_model: Optional[dict],
+    rpm_limit_for_key_model: Optional[dict],
+    model: Optional[str],
+) -> bool:
+    """
+    True if the key has a tpm / rpm limit for this specific model - otherwise the model + API Key bucket isn't tracked
+    """
+    if model is None:
+        return False
+    return (tpm_limit_for_key_model or {}).get(model) is not None or (
+        rpm_limit_for_key_model or {}
+    ).get(model) is not None
+
+
+def _get_precise_minute(now: datetime) -> str:
+    """
+    Minute bucket used in the rate limit keys - e.g. "2024-10-15-13-05"
+
+    Same as `now.strftime("%Y-%m-%d-%H-%M")`, without the cost of strftime on every request
+    """
+    return (
+        f"{now.year:04d}-{now.month:02d}-{now.day:02d}-{now.hour:02d}-{now.minute:02d}"
+    )
+
+
+@lru_cache(maxsize=2)
+def _get_precise_minute_for_index(minute_index: int) -> str:
+    """
+    Minute bucket for `minute_index` - the minutes since epoch, i.e. `int(time.time()) // 60`
+
+    Cached, so the datetime + string are only built once per minute
+    """
+    return _get_precise_minute(datetime.fromtimestamp(minute_index * 60))
+
+
+def _get_current_precise_minute() -> str:
+    return _get_precise_minute_for_index(int(time.time()) // 60)
+
+
+def _get_request_count_key(prefix: str, precise_minute: str) -> str:
+    """
+    Cache key for the usage of `prefix` (api key / user / team / ...) in this minute
+    """
+    return f"{prefix}::{precise_minute}::request_count"
+
+
+def _get_new_request_increment(request_count_api_key: str) -> DictIncrementOperation:
+    """
+    Increment for 1 new in-flight request. tpm/rpm are updated once the request completes.
+    """
+    return DictIncrementOperation(
+        key=request_count_api_key,
+        increments={"current_requests": 1, "current_tpm": 0, "current_rpm": 0},
+        ttl=60,
+    )
+
+
+def _merge_increments(
+    increment_list: List[DictIncrementOperation],
+) -> List[DictIncrementOperation]:
+    """
+    Merge the increments for the same key into 1 increment
+    """
+    merged: Dict[str, DictIncrementOperation] = {}
+    for increment_op in increment_list:
+        key = increment_op["key"]
+        if key not in merged:
+            merged[key] = DictIncrementOperation(
+                key=key,
+                increments=dict(increment_op["increments"]),
+                ttl=increment_op["ttl"],
+            )
+            continue
+        increments = merged[key]["increments"]
+        for field, value in increment_op["increments"].items():
+            increments[field] = increments.get(field, 0) + value
+    return list(merged.values())
+
+
+def _get_released_request_increment(
+    request_count_api_key: str,
+) -> DictIncrementOperation:
+    """
+    Increment for 1 request that's no longer in-flight, without counting its usage
+    """
+    return DictIncrementOperation(
+        key=request_count_api_key,
+        increments={"current_requests": -1, "current_tpm": 0, "current_rpm": 0},
+        ttl=60,
+    )
+
+
+def _get_completed_request_increment(
+    request_count_api_key: str, total_tokens: int
+) -> DictIncrementOperation:
+    """
+    Increment for 1 completed request - it's no longer in-flight, and its tokens count towards tpm
+    """
+    return DictIncrementOperation(
+        key=request_count_api_key,
+        increments={
+            "current_requests": -1,
+            "current_tpm": total_tokens,
+            "current_rpm": 1,
+        },
+        ttl=60,
+    )
 
 
 class _PROXY_MaxParallelRequestsHandler(CustomLogger):
     # Class variables or attributes
-    def __init__(self, internal_usage_cache: InternalUsageCache):
+    def __init__(
+        self,
+        internal_usage_cache: InternalUsageCache,
+        batch_window_ms: Optional[int] = None,
+    ):
         self.internal_usage_cache = internal_usage_cache
+        self.batch_window_ms = batch_window_ms
+        self.redis_increment_operation_queue: List[DictIncrementOperation] = []
+        self._redis_flush_task: Optional[asyncio.Task] = None
 
     def print_verbose(self, print_statement):
-        try:
-            verbose_proxy_logger.debug(print_statement)
-            if litellm.set_verbose:
-                print(print_statement)  # noqa
-        except Exception:
-            pass
+        verbose_proxy_logger.debug(print_statement)
+        if litellm.set_verbose:
+            print(print_statement)  # noqa
 
     async def check_key_in_limits(
         self,
@@ -57,42 +178,29 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
         cache: DualCache,
         data: dict,
         call_type: str,
-        max_parallel_requests: int,
-        tpm_limit: int,
-        rpm_limit: int,
-        current: Optional[dict],
-        request_count_api_key: str,
+        max_parallel_requests: Optional[int],
+        tpm_limit: Optional[int],
+        rpm_limit: Optional[int],
+        current: CurrentItemRateLimit,
         rate_limit_type: Literal["user", "customer", "team"],
-        values_to_update_in_cache: List[Tuple[Any, Any]],
     ):
-        # current = await self.internal_usage_cache.async_get_cache(
-        #     key=request_count_api_key,
-        #     litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
-        # )  # {"current_requests": 1, "current_tpm": 1, "current_rpm": 10}
-        if current is None:
-            if max_parallel_requests == 0 or tpm_limit == 0 or rpm_limit == 0:
-                # base case
-                return self.raise_rate_limit_error(
-                    additional_details=f"Hit limit for {rate_limit_type}. Current limits: max_parallel_requests: {max_parallel_requests}, tpm_limit: {tpm_limit}, rpm_limit: {rpm_limit}"
-                )
-            new_val = {
-                "current_requests": 1,
-                "current_tpm": 0,
-                "current_rpm": 0,
-            }
-            values_to_update_in_cache.append((request_count_api_key, new_val))
+        """
+        `current` is the usage incl. this request - {"current_requests": 1, "current_tpm": 1, "current_rpm": 10}
+        """
+        if max_parallel_requests == 0 or tpm_limit == 0 or rpm_limit == 0:
+            # base case
+            return self.raise_rate_limit_error(
+                additional_details=f"Hit limit for {rate_limit_type}. Current limits: max_parallel_requests: {max_parallel_requests}, tpm_limit: {tpm_limit}, rpm_limit: {rpm_limit}"
+            )
         elif (
-            int(current["current_requests"]) < max_parallel_requests
-            and current["current_tpm"] < tpm_limit
-            and current["current_rpm"] < rpm_limit
+            (
+                max_parallel_requests is None
+                or current["current_requests"] <= max_parallel_requests
+            )
+            and (tpm_limit is None or current["current_tpm"] < tpm_limit)
+            and (rpm_limit is None or current["current_rpm"] < rpm_limit)
         ):
-            # Increase count for this token
-            new_val = {
-                "current_requests": current["current_requests"] + 1,
-                "current_tpm": current["current_tpm"],
-                "current_rpm": current["current_rpm"],
-            }
-            values_to_update_in_cache.append((request_count_api_key, new_val))
+            pass
         else:
             raise HTTPException(
                 status_code=429,
@@ -101,16 +209,8 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
             )
 
     def time_to_next_minute(self) -> float:
-        # Get the current time
         now = datetime.now()
-
-        # Calculate the next minute
-        next_minute = (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
-
-        # Calculate the difference in seconds
-        seconds_to_next_minute = (next_minute - now).total_seconds()
-
-        return seconds_to_next_minute
+        return 60 - now.second - now.microsecond / 1_000_000
 
     def raise_rate_limit_error(
         self, additional_details: Optional[str] = None
@@ -127,43 +227,33 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
             headers={"retry-after": str(self.time_to_next_minute())},
         )
 
-    async def get_all_cache_objects(
-        self,
-        current_global_requests: Optional[str],
-        request_count_api_key: Optional[str],
-        request_count_user_id: Optional[str],
-        request_count_team_id: Optional[str],
-        request_count_end_user_id: Optional[str],
-        parent_otel_span: Optional[Span] = None,
-    ) -> CacheObject:
-        keys = [
-            current_global_requests,
-            request_count_api_key,
-            request_count_user_id,
-            request_count_team_id,
-            request_count_end_user_id,
-        ]
-        results = await self.internal_usage_cache.async_batch_get_cache(
-            keys=keys,
-            parent_otel_span=parent_otel_span,
-        )
+    async def _load_missing_usage_from_redis(
+        self, keys: List[str], parent_otel_span: Optional[Span] = None
+    ) -> None:
+        """
+        Load the usage buckets that aren't in memory yet from redis (e.g. set by other instances).
 
-        if results is None:
-            return CacheObject(
-                current_global_requests=None,
-                request_count_api_key=None,
-                request_count_user_id=None,
-                request_count_team_id=None,
-                request_count_end_user_id=None,
-            )
+        A bucket is only set if it's still missing once redis returns - concurrent requests may have
+        incremented it in memory during the read, and those increments must not be overwritten.
+        The background sync with redis adds any usage that's missing from an existing bucket.
+        """
+        redis_cache = self.internal_usage_cache.dual_cache.redis_cache
+        if redis_cache is None or litellm.approximate_rate_limits:
+            return
 
-        return CacheObject(
-            current_global_requests=results[0],
-            request_count_api_key=results[1],
-            request_count_user_id=results[2],
-            request_count_team_id=results[3],
-            request_count_end_user_id=results[4],
+        in_memory_cache = self.internal_usage_cache.dual_cache.in_memory_cache
+        missing_keys = [
+            key for key in keys if in_memory_cache.get_cache(key=key) is None
+        ]
+        if len(missing_keys) == 0:
+            return
+
+        redis_values = await redis_cache.async_batch_get_cache(
+            key_list=missing_keys, parent_otel_span=parent_otel_span
         )
+        for key, value in (redis_values or {}).items():
+            if value is not None and in_memory_cache.get_cache(key=key) is None:
+                in_memory_cache.set_cache(key, value, ttl=60)
 
     async def async_pre_call_hook(  # noqa: PLR0915
         self,
@@ -174,196 +264,285 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
     ):
         self.print_verbose("Inside Max Parallel Request Pre-Call Hook")
         api_key = user_api_key_dict.api_key
-        max_parallel_requests = user_api_key_dict.max_parallel_requests
-        if max_parallel_requests is None:
-            max_parallel_requests = sys.maxsize
+        max_parallel_requests = (
+            user_api_key_dict.max_parallel_requests
+        )  # None = no limit
         if data is None:
             data = {}
         global_max_parallel_requests = data.get("metadata", {}).get(
             "global_max_parallel_requests", None
         )
-        tpm_limit = getattr(user_api_key_dict, "tpm_limit", sys.maxsize)
-        if tpm_limit is None:
-            tpm_limit = sys.maxsize
-        rpm_limit = getattr(user_api_key_dict, "rpm_limit", sys.maxsize)
-        if rpm_limit is None:
-            rpm_limit = sys.maxsize
-
-        values_to_update_in_cache: List[Tuple[Any, Any]] = (
-            []
-        )  # values that need to get updated in cache, will run a batch_set_cache after this function
+        tpm_limit = getattr(user_api_key_dict, "tpm_limit", None)
+        rpm_limit = getattr(user_api_key_dict, "rpm_limit", None)
+        _tpm_limit_for_key_model = get_key_model_tpm_limit(user_api_key_dict)
+        _rpm_limit_for_key_model = get_key_model_rpm_limit(user_api_key_dict)
 
-        # ------------
-        # Setup values
-        # ------------
-        new_val: Optional[dict] = None
+        if (
+            global_max_parallel_requests is None
+            and max_parallel_requests is None
+            and tpm_limit is None
+            and rpm_limit is None
+            and user_api_key_dict.user_id is None
+            and user_api_key_dict.team_id is None
+            and not user_api_key_dict.end_user_id
+            and _tpm_limit_for_key_model is None
+            and _rpm_limit_for_key_model is None
+        ):
+            # nothing to rate limit - skip the cache reads / writes
+            return
+
+        values_to_increment_in_cache: List[DictIncrementOperation] = (
+            []
+        )  # counters that need to get incremented in cache, will run 1 increment pipeline after this function
 
         if global_max_parallel_requests is not None:
-            # get value from cache
+            # increment first, then check the returned value - no window between the read and the write
             _key = "global_max_parallel_requests"
-            current_global_requests = await self.internal_usage_cache.async_get_cache(
-                key=_key,
-                local_only=True,
-                litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
-            )
-            # check if below limit
-            if current_global_requests is None:
-                current_global_requests = 1
-            # if above -> raise error
-            if current_global_requests >= global_max_parallel_requests:
-                return self.raise_rate_limit_error(
-                    additional_details=f"Hit Global Limit: Limit={global_max_parallel_requests}, current: {current_global_requests}"
-                )
-            # if below -> increment
-            else:
+            current_global_requests = (
                 await self.internal_usage_cache.async_increment_cache(
                     key=_key,
                     value=1,
                     local_only=True,
                     litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
                 )
+            )
+            # if above -> release the slot we just took + raise error
+            if current_global_requests > global_max_parallel_requests:
+                await self.internal_usage_cache.async_increment_cache(
+                    key=_key,
+                    value=-1,
+                    local_only=True,
+                    litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
+                )
+                return self.raise_rate_limit_error(
+                    additional_details=f"Hit Global Limit: Limit={global_max_parallel_requests}, current: {current_global_requests - 1}"
+                )
+
+        precise_minute = _get_current_precise_minute()
+
+        # ------------
+        # Cache keys - 1 per scope with a limit to check
+        # ------------
+        request_count_api_key: Optional[str] = None
+        if api_key is not None and (
+            max_parallel_requests is not None
+            or tpm_limit is not None
+            or rpm_limit is not None
+        ):
+            request_count_api_key = _get_request_count_key(api_key, precise_minute)
+
+        # model-specific limits for this key are tracked in their own bucket - only for models that have one
+        _model = data.get("model", None)
+        request_count_model_key: Optional[str] = None
+        if _has_key_model_limit(
+            tpm_limit_for_key_model=_tpm_limit_for_key_model,
+            rpm_limit_for_key_model=_rpm_limit_for_key_model,
+            model=_model,
+        ):
+            request_count_model_key = _get_request_count_key(
+                f"{api_key}::{_model}", precise_minute
+            )
+
+        request_count_user_id: Optional[str] = None
+        if user_api_key_dict.user_id is not None:
+            request_count_user_id = _get_request_count_key(
+                user_api_key_dict.user_id, precise_minute
+            )
+
+        request_count_team_id: Optional[str] = None
+        if user_api_key_dict.team_id is not None:
+            request_count_team_id = _get_request_count_key(
+                user_api_key_dict.team_id, precise_minute
+            )
+
+        request_count_end_user_id: Optional[str] = None
+        if user_api_key_dict.end_user_id:
+            request_count_end_user_id = _get_request_count_key(
+                user_api_key_dict.end_user_id, precise_minute
+            )
+
+        # load the counters this instance doesn't have yet from redis (1 batch), before they're incremented
+        await self._load_missing_usage_from_redis(
+            keys=[
+                request_count_key
+                for request_count_key in (
+                    request_count_api_key,
+                    request_count_model_key,
+                    request_count_user_id,
+                    request_count_team_id,
+                    request_count_end_user_id,
+                )
+                if request_count_key is not None
+            ],
+            parent_otel_span=user_api_key_dict.parent_otel_span,
+        )
+        # ------------
+        # Increment + check all limits in 1 step
+        # ------------
+        # the counters are incremented first and the limits are checked against the incremented values,
+        # with no await in between, so 2 concurrent requests can't both take the last slot
+        for request_count_key in (
+            request_count_api_key,
+            request_count_model_key,
+            request_count_user_id,
+            request_count_team_id,
+            request_count_end_user_id,
+        ):
+            if request_count_key is not None:
+                values_to_increment_in_cache.append(
+                    _get_new_request_increment(request_count_key)
+                )
 
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        current_hour = datetime.now().strftime("%H")
-        current_minute = datetime.now().strftime("%M")
-        precise_minute = f"{current_date}-{current_hour}-{current_minute}"
-
-        cache_objects: CacheObject = await self.get_all_cache_objects(
-            current_global_requests=(
-                "global_max_parallel_requests"
-                if global_max_parallel_requests is not None
-                else None
-            ),
-            request_count_api_key=(
-                f"{api_key}::{precise_minute}::request_count"
-                if api_key is not None
-                else None
-            ),
-            request_count_user_id=(
-                f"{user_api_key_dict.user_id}::{precise_minute}::request_count"
-                if user_api_key_dict.user_id is not None
-                else None
-            ),
-            request_count_team_id=(
-                f"{user_api_key_dict.team_id}::{precise_minute}::request_count"
-                if user_api_key_dict.team_id is not None
-                else None
-            ),
-            request_count_end_user_id=(
-                f"{user_api_key_dict.end_user_id}::{precise_minute}::request_count"
-                if user_api_key_dict.end_user_id is not None
-                else None
-            ),
+        current_usage = await self._increment_local_usage(
+            increment_list=values_to_increment_in_cache,
             parent_otel_span=user_api_key_dict.parent_otel_span,
         )
-        if api_key is not None:
-            request_count_api_key = f"{api_key}::{precise_minute}::request_count"
+        try:
+            await self._check_usage_in_limits(
+                user_api_key_dict=user_api_key_dict,
+                cache=cache,
+                data=data,
+                call_type=call_type,
+                current_usage=current_usage,
+                max_parallel_requests=max_parallel_requests,
+                tpm_limit=tpm_limit,
+                rpm_limit=rpm_limit,
+                request_count_api_key=request_count_api_key,
+                request_count_model_key=request_count_model_key,
+                tpm_limit_for_key_model=_tpm_limit_for_key_model,
+                rpm_limit_for_key_model=_rpm_limit_for_key_model,
+                request_count_user_id=request_count_user_id,
+                request_count_team_id=request_count_team_id,
+                request_count_end_user_id=request_count_end_user_id,
+            )
+        except HTTPException:
+            # request is rejected - give back the slots it took, incl. the global one (the failure hook isn't called for it)
+            await self._increment_local_usage(
+                increment_list=[
+                    DictIncrementOperation(
+                        key=increment_op["key"],
+                        increments={"current_requests": -1},
+                        ttl=increment_op["ttl"],
+                    )
+                    for increment_op in values_to_increment_in_cache
+                ],
+                parent_otel_span=user_api_key_dict.parent_otel_span,
+            )
+            if global_max_parallel_requests is not None:
+                await self.internal_usage_cache.async_increment_cache(
+                    key="global_max_parallel_requests",
+                    value=-1,
+                    local_only=True,
+                    litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
+                )
+            raise
 
+        self._increment_redis_usage(increment_list=values_to_increment_in_cache)
+
+        # marks the request as rate limited, so the success / failure hooks release its slot in the buckets it was counted in
+        # `litellm_metadata` is litellm's metadata on routes where `metadata` is a param for the provider.
+        # pass-through requests send `data` to the provider as-is - `litellm_metadata` is moved to the request's metadata before the call
+        _metadata_variable_name = (
+            "litellm_metadata"
+            if call_type == "pass_through_endpoint" or "litellm_metadata" in data
+            else "metadata"
+        )
+        if data.get(_metadata_variable_name) is None:
+            data[_metadata_variable_name] = {}
+        data[_metadata_variable_name]["rate_limit_precise_minute"] = precise_minute
+        if global_max_parallel_requests is not None:
+            # so the success / failure hooks release the global slot, if it was read from another metadata field
+            data[_metadata_variable_name].setdefault(
+                "global_max_parallel_requests", global_max_parallel_requests
+            )
+
+        return
+
+    async def _check_usage_in_limits(  # noqa: PLR0915
+        self,
+        user_api_key_dict: UserAPIKeyAuth,
+        cache: DualCache,
+        data: dict,
+        call_type: str,
+        current_usage: Dict[str, CurrentItemRateLimit],
+        max_parallel_requests: Optional[int],
+        tpm_limit: Optional[int],
+        rpm_limit: Optional[int],
+        request_count_api_key: Optional[str],
+        request_count_model_key: Optional[str],
+        tpm_limit_for_key_model: Optional[dict],
+        rpm_limit_for_key_model: Optional[dict],
+        request_count_user_id: Optional[str],
+        request_count_team_id: Optional[str],
+        request_count_end_user_id: Optional[str],
+    ):
+        """
+        Raise a 429 if the usage - incl. this request - is over any of the limits
+        """
+        api_key = user_api_key_dict.api_key
+        if request_count_api_key is not None:
             # CHECK IF REQUEST ALLOWED for key
 
-            current = cache_objects["request_count_api_key"]
-            self.print_verbose(f"current: {current}")
-            if (
-                max_parallel_requests == sys.maxsize
-                and tpm_limit == sys.maxsize
-                and rpm_limit == sys.maxsize
-            ):
-                pass
-            elif max_parallel_requests == 0 or tpm_limit == 0 or rpm_limit == 0:
+            current = current_usage[request_count_api_key]
+            verbose_proxy_logger.debug("current: %s", current)
+            if max_parallel_requests == 0 or tpm_limit == 0 or rpm_limit == 0:
                 return self.raise_rate_limit_error(
                     additional_details=f"Hit limit for api_key: {api_key}. max_parallel_requests: {max_parallel_requests}, tpm_limit: {tpm_limit}, rpm_limit: {rpm_limit}"
                 )
-            elif current is None:
-                new_val = {
-                    "current_requests": 1,
-                    "current_tpm": 0,
-                    "current_rpm": 0,
-                }
-                values_to_update_in_cache.append((request_count_api_key, new_val))
             elif (
-                int(current["current_requests"]) < max_parallel_requests
-                and current["current_tpm"] < tpm_limit
-                and current["current_rpm"] < rpm_limit
+                (
+                    max_parallel_requests is None
+                    or current["current_requests"] <= max_parallel_requests
+                )
+                and (tpm_limit is None or current["current_tpm"] < tpm_limit)
+                and (rpm_limit is None or current["current_rpm"] < rpm_limit)
             ):
-                # Increase count for this token
-                new_val = {
-                    "current_requests": current["current_requests"] + 1,
-                    "current_tpm": current["current_tpm"],
-                    "current_rpm": current["current_rpm"],
-                }
-                values_to_update_in_cache.append((request_count_api_key, new_val))
+                pass
             else:
                 return self.raise_rate_limit_error(
                     additional_details=f"Hit limit for api_key: {api_key}. tpm_limit: {tpm_limit}, current_tpm {current['current_tpm']} , rpm_limit: {rpm_limit} current rpm {current['current_rpm']} "
                 )
 
         # Check if request under RPM/TPM per model for a given API Key
-        if (
-            get_key_model_tpm_limit(user_api_key_dict) is not None
-            or get_key_model_rpm_limit(user_api_key_dict) is not None
-        ):
-            _model = data.get("model", None)
-            request_count_api_key = (
-                f"{api_key}::{_model}::{precise_minute}::request_count"
-            )
-
-            current = await self.internal_usage_cache.async_get_cache(
-                key=request_count_api_key,
-                litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
-            )  # {"current_requests": 1, "current_tpm": 1, "current_rpm": 10}
+        if request_count_model_key is not None:
+            current = current_usage[
+                request_count_model_key
+            ]  # {"current_requests": 1, "current_tpm": 1, "current_rpm": 10}
 
             tpm_limit_for_model = None
             rpm_limit_for_model = None
 
-            _tpm_limit_for_key_model = get_key_model_tpm_limit(user_api_key_dict)
-            _rpm_limit_for_key_model = get_key_model_rpm_limit(user_api_key_dict)
-
+            _model = data.get("model", None)
             if _model is not None:
 
-                if _tpm_limit_for_key_model:
-                    tpm_limit_for_model = _tpm_limit_for_key_model.get(_model)
-
-                if _rpm_limit_for_key_model:
-                    rpm_limit_for_model = _rpm_limit_for_key_model.get(_model)
-            if current is None:
-                new_val = {
-                    "current_requests": 1,
-                    "current_tpm": 0,
-                    "current_rpm": 0,
-                }
-                values_to_update_in_cache.append((request_count_api_key, new_val))
-            elif tpm_limit_for_model is not None or rpm_limit_for_model is not None:
-                # Increase count for this token
-                new_val = {
-                    "current_requests": current["current_requests"] + 1,
-                    "current_tpm": current["current_tpm"],
-                    "current_rpm": current["current_rpm"],
-                }
-                if (
-                    tpm_limit_for_model is not None
-                    and current["current_tpm"] >= tpm_limit_for_model
-                ):
-                    return self.raise_rate_limit_error(
-                        additional_details=f"Hit TPM limit for model: {_model} on api_key: {api_key}. tpm_limit: {tpm_limit_for_model}, current_tpm {current['current_tpm']} "
-                    )
-                elif (
-                    rpm_limit_for_model is not None
-                    and current["current_rpm"] >= rpm_limit_for_model
-                ):
-                    return self.raise_rate_limit_error(
-                        additional_details=f"Hit RPM limit for model: {_model} on api_key: {api_key}. rpm_limit: {rpm_limit_for_model}, current_rpm {current['current_rpm']} "
-                    )
-                else:
-                    values_to_update_in_cache.append((request_count_api_key, new_val))
+                if tpm_limit_for_key_model:
+                    tpm_limit_for_model = tpm_limit_for_key_model.get(_model)
+
+                if rpm_limit_for_key_model:
+                    rpm_limit_for_model = rpm_limit_for_key_model.get(_model)
+
+            if (
+                tpm_limit_for_model is not None
+                and current["current_tpm"] >= tpm_limit_for_model
+            ):
+                return self.raise_rate_limit_error(
+                    additional_details=f"Hit TPM limit for model: {_model} on api_key: {api_key}. tpm_limit: {tpm_limit_for_model}, current_tpm {current['current_tpm']} "
+                )
+            elif (
+                rpm_limit_for_model is not None
+                and current["current_rpm"] >= rpm_limit_for_model
+            ):
+                return self.raise_rate_limit_error(
+                    additional_details=f"Hit RPM limit for model: {_model} on api_key: {api_key}. rpm_limit: {rpm_limit_for_model}, current_rpm {current['current_rpm']} "
+                )
 
             _remaining_tokens = None
             _remaining_requests = None
             # Add remaining tokens, requests to metadata
-            if new_val:
-                if tpm_limit_for_model is not None:
-                    _remaining_tokens = tpm_limit_for_model - new_val["current_tpm"]
-                if rpm_limit_for_model is not None:
-                    _remaining_requests = rpm_limit_for_model - new_val["current_rpm"]
+            if tpm_limit_for_model is not None:
+                _remaining_tokens = tpm_limit_for_model - current["current_tpm"]
+            if rpm_limit_for_model is not None:
+                _remaining_requests = rpm_limit_for_model - current["current_rpm"]
 
             _remaining_limits_data = {
                 f"litellm-key-remaining-tokens-{_model}": _remaining_tokens,
@@ -375,139 +554,229 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
             data["metadata"].update(_remaining_limits_data)
 
         # check if REQUEST ALLOWED for user_id
-        user_id = user_api_key_dict.user_id
-        if user_id is not None:
+        if request_count_user_id is not None:
             user_tpm_limit = user_api_key_dict.user_tpm_limit
             user_rpm_limit = user_api_key_dict.user_rpm_limit
-            if user_tpm_limit is None:
-                user_tpm_limit = sys.maxsize
-            if user_rpm_limit is None:
-                user_rpm_limit = sys.maxsize
 
-            request_count_api_key = f"{user_id}::{precise_minute}::request_count"
-            # print(f"Checking if {request_count_api_key} is allowed to make request for minute {precise_minute}")
             await self.check_key_in_limits(
                 user_api_key_dict=user_api_key_dict,
                 cache=cache,
                 data=data,
                 call_type=call_type,
-                max_parallel_requests=sys.maxsize,  # TODO: Support max parallel requests for a user
-                current=cache_objects["request_count_user_id"],
-                request_count_api_key=request_count_api_key,
+                max_parallel_requests=None,  # TODO: Support max parallel requests for a user
+                current=current_usage[request_count_user_id],
                 tpm_limit=user_tpm_limit,
                 rpm_limit=user_rpm_limit,
                 rate_limit_type="user",
-                values_to_update_in_cache=values_to_update_in_cache,
             )
 
         # TEAM RATE LIMITS
         ## get team tpm/rpm limits
-        team_id = user_api_key_dict.team_id
-        if team_id is not None:
+        if request_count_team_id is not None:
             team_tpm_limit = user_api_key_dict.team_tpm_limit
             team_rpm_limit = user_api_key_dict.team_rpm_limit
 
-            if team_tpm_limit is None:
-                team_tpm_limit = sys.maxsize
-            if team_rpm_limit is None:
-                team_rpm_limit = sys.maxsize
-
-            request_count_api_key = f"{team_id}::{precise_minute}::request_count"
-            # print(f"Checking if {request_count_api_key} is allowed to make request for minute {precise_minute}")
             await self.check_key_in_limits(
                 user_api_key_dict=user_api_key_dict,
                 cache=cache,
                 data=data,
                 call_type=call_type,
-                max_parallel_requests=sys.maxsize,  # TODO: Support max parallel requests for a team
-                current=cache_objects["request_count_team_id"],
-                request_count_api_key=request_count_api_key,
+                max_parallel_requests=None,  # TODO: Support max parallel requests for a team
+                current=current_usage[request_count_team_id],
                 tpm_limit=team_tpm_limit,
                 rpm_limit=team_rpm_limit,
                 rate_limit_type="team",
-                values_to_update_in_cache=values_to_update_in_cache,
             )
 
         # End-User Rate Limits
         # Only enforce if user passed `user` to /chat, /completions, /embeddings
-        if user_api_key_dict.end_user_id:
-            end_user_tpm_limit = getattr(
-                user_api_key_dict, "end_user_tpm_limit", sys.maxsize
-            )
-            end_user_rpm_limit = getattr(
-                user_api_key_dict, "end_user_rpm_limit", sys.maxsize
-            )
-
-            if end_user_tpm_limit is None:
-                end_user_tpm_limit = sys.maxsize
-            if end_user_rpm_limit is None:
-                end_user_rpm_limit = sys.maxsize
+        if request_count_end_user_id is not None:
+            end_user_tpm_limit = getattr(user_api_key_dict, "end_user_tpm_limit", None)
+            end_user_rpm_limit = getattr(user_api_key_dict, "end_user_rpm_limit", None)
 
             # now do the same tpm/rpm checks
-            request_count_api_key = (
-                f"{user_api_key_dict.end_user_id}::{precise_minute}::request_count"
-            )
-
-            # print(f"Checking if {request_count_api_key} is allowed to make request for minute {precise_minute}")
             await self.check_key_in_limits(
                 user_api_key_dict=user_api_key_dict,
                 cache=cache,
                 data=data,
                 call_type=call_type,
-                max_parallel_requests=sys.maxsize,  # TODO: Support max parallel requests for an End-User
-                request_count_api_key=request_count_api_key,
-                current=cache_objects["request_count_end_user_id"],
+                max_parallel_requests=None,  # TODO: Support max parallel requests for an End-User
+                current=current_usage[request_count_end_user_id],
                 tpm_limit=end_user_tpm_limit,
                 rpm_limit=end_user_rpm_limit,
                 rate_limit_type="customer",
-                values_to_update_in_cache=values_to_update_in_cache,
             )
 
-        asyncio.create_task(
-            self.internal_usage_cache.async_batch_set_cache(
-                cache_list=values_to_update_in_cache,
-                ttl=60,
-                litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
-            )  # don't block execution for cache updates
+    async def _increment_local_usage(
+        self,
+        increment_list: List[DictIncrementOperation],
+        parent_otel_span: Optional[Span],
+    ) -> Dict[str, CurrentItemRateLimit]:
+        """
+        Atomically increment the in-memory usage counters, so the next request on this instance sees them
+
+        Returns - Dict[str, CurrentItemRateLimit] - the incremented counters, by key
+        """
+        if len(increment_list) == 0:
+            return {}
+
+        results = await self.internal_usage_cache.async_increment_dict_pipeline(
+            increment_list=increment_list,
+            local_only=True,
+            litellm_parent_otel_span=parent_otel_span,
         )
+        return {
+            increment_op["key"]: cast(CurrentItemRateLimit, result)
+            for increment_op, result in zip(increment_list, results or [])
+        }
 
-        return
+    def _increment_redis_usage(
+        self,
+        increment_list: List[DictIncrementOperation],
+    ) -> None:
+        """
+        Queue the increments for redis. They're pushed in the background, so this doesn't block the request.
+        """
+        if (
+            len(increment_list) == 0
+            or self.internal_usage_cache.dual_cache.redis_cache is None
+        ):
+            return
 
-    async def async_log_success_event(  # noqa: PLR0915
-        self, kwargs, response_obj, start_time, end_time
-    ):
+        self.redis_increment_operation_queue.extend(increment_list)
+        if self._redis_flush_task is None or self._redis_flush_task.done():
+            self._redis_flush_task = asyncio.create_task(
+                self._push_increments_to_redis()
+            )
+
+    def _get_batch_window_ms(self) -> int:
+        """
+        Batch window for the redis pushes - `batch_window_ms` if set on the handler, else `litellm.rate_limit_redis_batch_window_ms`, else DEFAULT_REDIS_BATCH_WINDOW_MS
+
+        Read on every push, so the `litellm_settings` value loaded after the proxy starts is used
+        """
+        if self.batch_window_ms is not None:
+            return self.batch_window_ms
+        if litellm.rate_limit_redis_batch_window_ms is not None:
+            return litellm.rate_limit_redis_batch_window_ms
+        return DEFAULT_REDIS_BATCH_WINDOW_MS
+
+    async def _push_increments_to_redis(self):
+        """
+        Push the queued increments to redis every batch window, in 1 pipeline per window
+
+        Increments for the same key are merged, so concurrent requests on the same key cost 1 op per window.
+        Exits once the queue is empty, and is restarted by the next `_increment_redis_usage` call.
+
+        If `litellm.approximate_rate_limits` is True, this runs every DEFAULT_REDIS_SYNC_INTERVAL seconds instead.
+        """
+        while len(self.redis_increment_operation_queue) > 0:
+            if litellm.approximate_rate_limits is True:
+                await asyncio.sleep(DEFAULT_REDIS_SYNC_INTERVAL)
+            else:
+                await asyncio.sleep(self._get_batch_window_ms() / 1000)
+            increment_list = _merge_increments(self.redis_increment_operation_queue)
+            self.redis_increment_operation_queue = []
+
+            redis_cache = self.internal_usage_cache.dual_cache.redis_cache
+            if redis_cache is None:
+                continue
+            try:
+                redis_values = await redis_cache.async_increment_dict_pipeline(
+                    increment_list=increment_list
+                )
+            except Exception as e:
+                verbose_proxy_logger.error(
+                    f"Error pushing rate limit increments to Redis: {str(e)}"
+                )
+                continue
+
+            self._sync_in_memory_usage_with_redis(
+                increment_list=increment_list, redis_values=redis_values
+            )
+
+    def _sync_in_memory_usage_with_redis(
+        self, increment_list: List[DictIncrementOperation], redis_values: List
+    ) -> None:
+        """
+        Overwrite the in-memory usage with the usage in redis, which includes the usage of all instances
+
+        Increments that are still queued aren't in redis yet, so they're added on top.
+        """
+        pending_increments = {
+            increment_op["key"]: increment_op["increments"]
+            for increment_op in _merge_increments(self.redis_increment_operation_queue)
+        }
+        in_memory_cache = self.internal_usage_cache.dual_cache.in_memory_cache
+        for increment_op, redis_value in zip(increment_list, redis_values):
+            if not isinstance(redis_value, dict):
+                continue
+            value = dict(redis_value)
+            for field, delta in pending_increments.get(increment_op["key"], {}).items():
+                value[field] = max(value.get(field, 0) + delta, 0)
+            in_memory_cache.set_cache(
+                key=increment_op["key"], value=value, ttl=increment_op["ttl"]
+            )
+
+    def _get_usage_scope_ids(self, kwargs: dict) -> List[str]:
+        """
+        Ids of the scopes a completed / failed request's usage is tracked in - API Key, model group + API Key, User, Team, End User
+        """
         from litellm.proxy.common_utils.callback_utils import (
             get_model_group_from_litellm_kwargs,
         )
 
+        _metadata = kwargs["litellm_params"].get("metadata", {}) or {}
+        user_api_key = _metadata.get("user_api_key", None)
+        user_api_key_metadata = _metadata.get("user_api_key_metadata", {}) or {}
+
+        # usage for the model group + API Key is only tracked if the key has a limit for that model
+        model_group = get_model_group_from_litellm_kwargs(kwargs)
+        user_api_key_model_group: Optional[str] = None
+        if user_api_key is not None and _has_key_model_limit(
+            tpm_limit_for_key_model=user_api_key_metadata.get("model_tpm_limit"),
+            rpm_limit_for_key_model=user_api_key_metadata.get("model_rpm_limit"),
+            model=model_group,
+        ):
+            user_api_key_model_group = f"{user_api_key}::{model_group}"
+
+        return [
+            scope_id
+            for scope_id in (
+                user_api_key,
+                user_api_key_model_group,
+                _metadata.get("user_api_key_user_id", None),
+                _metadata.get("user_api_key_team_id", None),
+                kwargs.get("user"),
+            )
+            if scope_id is not None
+        ]
+
+    async def async_log_success_event(  # noqa: PLR0915
+        self, kwargs, response_obj, start_time, end_time
+    ):
         litellm_parent_otel_span: Union[Span, None] = _get_parent_otel_span_from_kwargs(
             kwargs=kwargs
         )
         try:
             self.print_verbose("INSIDE parallel request limiter ASYNC SUCCESS LOGGING")
-            global_max_parallel_requests = kwargs["litellm_params"]["metadata"].get(
-                "global_max_parallel_requests", None
-            )
-            user_api_key = kwargs["litellm_params"]["metadata"]["user_api_key"]
-            user_api_key_user_id = kwargs["litellm_params"]["metadata"].get(
-                "user_api_key_user_id", None
-            )
-            user_api_key_team_id = kwargs["litellm_params"]["metadata"].get(
-                "user_api_key_team_id", None
-            )
-            user_api_key_end_user_id = kwargs.get("user")
+            _metadata = kwargs["litellm_params"].get("metadata", {}) or {}
+            # minute the pre-call hook counted this request in - only set for requests it rate limited
+            request_precise_minute = _metadata.get("rate_limit_precise_minute")
+            if request_precise_minute is None:
+                # nothing was rate limited - no usage to update
+                return
 
-            user_api_key_metadata = (
-                kwargs["litellm_params"]["metadata"].get("user_api_key_metadata", {})
-                or {}
+            global_max_parallel_requests = _metadata.get(
+                "global_max_parallel_requests", None
             )
+            scope_ids = self._get_usage_scope_ids(kwargs=kwargs)
 
             # ------------
             # Setup values
             # ------------
 
             if global_max_parallel_requests is not None:
-                # get value from cache
                 _key = "global_max_parallel_requests"
                 # decrement
                 await self.internal_usage_cache.async_increment_cache(
@@ -517,10 +786,7 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
                     litellm_parent_otel_span=litellm_parent_otel_span,
                 )
 
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            current_hour = datetime.now().strftime("%H")
-            current_minute = datetime.now().strftime("%M")
-            precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+            precise_minute = _get_current_precise_minute()
 
             total_tokens = 0
 
@@ -528,296 +794,113 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
                 total_tokens = response_obj.usage.total_tokens  # type: ignore
 
             # ------------
-            # Update usage - API Key
-            # ------------
-
-            values_to_update_in_cache = []
-
-            if user_api_key is not None:
-                request_count_api_key = (
-                    f"{user_api_key}::{precise_minute}::request_count"
-                )
-
-                current = await self.internal_usage_cache.async_get_cache(
-                    key=request_count_api_key,
-                    litellm_parent_otel_span=litellm_parent_otel_span,
-                ) or {
-                    "current_requests": 1,
-                    "current_tpm": 0,
-                    "current_rpm": 0,
-                }
-
-                new_val = {
-                    "current_requests": max(current["current_requests"] - 1, 0),
-                    "current_tpm": current["current_tpm"] + total_tokens,
-                    "current_rpm": current["current_rpm"] + 1,
-                }
-
-                self.print_verbose(
-                    f"updated_value in success call: {new_val}, precise_minute: {precise_minute}"
-                )
-                values_to_update_in_cache.append((request_count_api_key, new_val))
-
-            # ------------
-            # Update usage - model group + API Key
-            # ------------
-            model_group = get_model_group_from_litellm_kwargs(kwargs)
-            if (
-                user_api_key is not None
-                and model_group is not None
-                and (
-                    "model_rpm_limit" in user_api_key_metadata
-                    or "model_tpm_limit" in user_api_key_metadata
-                )
-            ):
-                request_count_api_key = (
-                    f"{user_api_key}::{model_group}::{precise_minute}::request_count"
-                )
-
-                current = await self.internal_usage_cache.async_get_cache(
-                    key=request_count_api_key,
-                    litellm_parent_otel_span=litellm_parent_otel_span,
-                ) or {
-                    "current_requests": 1,
-                    "current_tpm": 0,
-                    "current_rpm": 0,
-                }
-
-                new_val = {
-                    "current_requests": max(current["current_requests"] - 1, 0),
-                    "current_tpm": current["current_tpm"] + total_tokens,
-                    "current_rpm": current["current_rpm"] + 1,
-                }
-
-                self.print_verbose(
-                    f"updated_value in success call: {new_val}, precise_minute: {precise_minute}"
-                )
-                values_to_update_in_cache.append((request_count_api_key, new_val))
-
-            # ------------
-            # Update usage - User
-            # ------------
-            if user_api_key_user_id is not None:
-                total_tokens = 0
-
-                if isinstance(response_obj, ModelResponse):
-                    total_tokens = response_obj.usage.total_tokens  # type: ignore
-
-                request_count_api_key = (
-                    f"{user_api_key_user_id}::{precise_minute}::request_count"
-                )
-
-                current = await self.internal_usage_cache.async_get_cache(
-                    key=request_count_api_key,
-                    litellm_parent_otel_span=litellm_parent_otel_span,
-                ) or {
-                    "current_requests": 1,
-                    "current_tpm": total_tokens,
-                    "current_rpm": 1,
-                }
-
-                new_val = {
-                    "current_requests": max(current["current_requests"] - 1, 0),
-                    "current_tpm": current["current_tpm"] + total_tokens,
-                    "current_rpm": current["current_rpm"] + 1,
-                }
-
-                self.print_verbose(
-                    f"updated_value in success call: {new_val}, precise_minute: {precise_minute}"
-                )
-                values_to_update_in_cache.append((request_count_api_key, new_val))
-
-            # ------------
-            # Update usage - Team
+            # Update usage - API Key, model group + API Key, User, Team, End User
             # ------------
-            if user_api_key_team_id is not None:
-                total_tokens = 0
-
-                if isinstance(response_obj, ModelResponse):
-                    total_tokens = response_obj.usage.total_tokens  # type: ignore
-
-                request_count_api_key = (
-                    f"{user_api_key_team_id}::{precise_minute}::request_count"
-                )
-
-                current = await self.internal_usage_cache.async_get_cache(
-                    key=request_count_api_key,
-                    litellm_parent_otel_span=litellm_parent_otel_span,
-                ) or {
-                    "current_requests": 1,
-                    "current_tpm": total_tokens,
-                    "current_rpm": 1,
-                }
-
-                new_val = {
-                    "current_requests": max(current["current_requests"] - 1, 0),
-                    "current_tpm": current["current_tpm"] + total_tokens,
-                    "current_rpm": current["current_rpm"] + 1,
-                }
-
-                self.print_verbose(
-                    f"updated_value in success call: {new_val}, precise_minute: {precise_minute}"
-                )
-                values_to_update_in_cache.append((request_count_api_key, new_val))
-
-            # ------------
-            # Update usage - End User
-            # ------------
-            if user_api_key_end_user_id is not None:
-                total_tokens = 0
-
-                if isinstance(response_obj, ModelResponse):
-                    total_tokens = response_obj.usage.total_tokens  # type: ignore
-
-                request_count_api_key = (
-                    f"{user_api_key_end_user_id}::{precise_minute}::request_count"
-                )
-
-                current = await self.internal_usage_cache.async_get_cache(
-                    key=request_count_api_key,
-                    litellm_parent_otel_span=litellm_parent_otel_span,
-                ) or {
-                    "current_requests": 1,
-                    "current_tpm": total_tokens,
-                    "current_rpm": 1,
-                }
-
-                new_val = {
-                    "current_requests": max(current["current_requests"] - 1, 0),
-                    "current_tpm": current["current_tpm"] + total_tokens,
-                    "current_rpm": current["current_rpm"] + 1,
-                }
-
-                self.print_verbose(
-                    f"updated_value in success call: {new_val}, precise_minute: {precise_minute}"
-                )
-                values_to_update_in_cache.append((request_count_api_key, new_val))
-
-            await self.internal_usage_cache.async_batch_set_cache(
-                cache_list=values_to_update_in_cache,
-                ttl=60,
-                litellm_parent_otel_span=litellm_parent_otel_span,
-            )
-        except Exception as e:
-            self.print_verbose(e)  # noqa
-
-    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
-        try:
-            self.print_verbose("Inside Max Parallel Request Failure Hook")
-            litellm_parent_otel_span: Union[Span, None] = (
-                _get_parent_otel_span_from_kwargs(kwargs=kwargs)
-            )
-            _metadata = kwargs["litellm_params"].get("metadata", {}) or {}
-            global_max_parallel_requests = _metadata.get(
-                "global_max_parallel_requests", None
-            )
-            user_api_key = _metadata.get("user_api_key", None)
-            self.print_verbose(f"user_api_key: {user_api_key}")
-            if user_api_key is None:
+            if len(scope_ids) == 0:
                 return
 
-            ## decrement call count if call failed
-            if "Max parallel request limit reached" in str(kwargs["exception"]):
-                pass  # ignore failed calls due to max limit being reached
+            # 1 atomic increment per key - no need to read the current usage first
+            if request_precise_minute == precise_minute:
+                values_to_increment_in_cache = [
+                    _get_completed_request_increment(
+                        request_count_api_key=_get_request_count_key(
+                            scope_id, precise_minute
+                        ),
+                        total_tokens=total_tokens,
+                    )
+                    for scope_id in scope_ids
+                ]
             else:
-                # ------------
-                # Setup values
-                # ------------
-
-                if global_max_parallel_requests is not None:
-                    # get value from cache
-                    _key = "global_max_parallel_requests"
-                    (
-                        await self.internal_usage_cache.async_get_cache(
-                            key=_key,
-                            local_only=True,
-                            litellm_parent_otel_span=litellm_parent_otel_span,
-                        )
+                # request started in an earlier minute - release its slot in that minute's buckets,
+                # and count its tokens + request in this minute's buckets
+                values_to_increment_in_cache = [
+                    _get_released_request_increment(
+                        _get_request_count_key(scope_id, request_precise_minute)
                     )
-                    # decrement
-                    await self.internal_usage_cache.async_increment_cache(
-                        key=_key,
-                        value=-1,
-                        local_only=True,
-                        litellm_parent_otel_span=litellm_parent_otel_span,
+                    for scope_id in scope_ids
+                ] + [
+                    DictIncrementOperation(
+                        key=_get_request_count_key(scope_id, precise_minute),
+                        increments={
+                            "current_requests": 0,
+                            "current_tpm": total_tokens,
+                            "current_rpm": 1,
+                        },
+                        ttl=60,
                     )
+                    for scope_id in scope_ids
+                ]
+            current_usage = await self._increment_local_usage(
+                increment_list=values_to_increment_in_cache,
+                parent_otel_span=litellm_parent_otel_span,
+            )
+            verbose_proxy_logger.debug(
+                "updated_value in success call: %s, precise_minute: %s",
+                current_usage,
+                precise_minute,
+            )
+            self._increment_redis_usage(increment_list=values_to_increment_in_cache)
+        except Exception as e:
+            self.print_verbose(e)  # noqa
 
-                current_date = datetime.now().strftime("%Y-%m-%d")
-                current_hour = datetime.now().strftime("%H")
-                current_minute = datetime.now().strftime("%M")
-                precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        self.print_verbose("Inside Max Parallel Request Failure Hook")
+        _litellm_params = kwargs.get("litellm_params") or {}
+        _metadata = _litellm_params.get("metadata", {}) or {}
+        user_api_key = _metadata.get("user_api_key", None)
+        verbose_proxy_logger.debug("user_api_key: %s", user_api_key)
+        # minute the pre-call hook counted this request in - only set for requests it rate limited
+        request_precise_minute = _metadata.get("rate_limit_precise_minute")
+        if user_api_key is None or request_precise_minute is None:
+            return
+
+        ## decrement call count if call failed
+        if "Max parallel request limit reached" in str(kwargs.get("exception", "")):
+            return  # ignore failed calls due to max limit being reached
 
-                request_count_api_key = (
-                    f"{user_api_key}::{precise_minute}::request_count"
-                )
+        # ------------
+        # Setup values
+        # ------------
+        litellm_parent_otel_span: Union[Span, None] = _get_parent_otel_span_from_kwargs(
+            kwargs=kwargs
+        )
+        global_max_parallel_requests = _metadata.get(
+            "global_max_parallel_requests", None
+        )
+        # ------------
+        # Update usage - release the request's slot in every scope, with 1 atomic decrement per key
+        # ------------
+        values_to_increment_in_cache = [
+            _get_released_request_increment(
+                _get_request_count_key(scope_id, request_precise_minute)
+            )
+            for scope_id in self._get_usage_scope_ids(kwargs=kwargs)
+        ]
 
-                # ------------
-                # Update usage
-                # ------------
-                current = await self.internal_usage_cache.async_get_cache(
-                    key=request_count_api_key,
-                    litellm_parent_otel_span=litellm_parent_otel_span,
-                ) or {
-                    "current_requests": 1,
-                    "current_tpm": 0,
-                    "current_rpm": 0,
-                }
-
-                new_val = {
-                    "current_requests": max(current["current_requests"] - 1, 0),
-                    "current_tpm": current["current_tpm"],
-                    "current_rpm": current["current_rpm"],
-                }
-
-                self.print_verbose(f"updated_value in failure call: {new_val}")
-                await self.internal_usage_cache.async_set_cache(
-                    request_count_api_key,
-                    new_val,
-                    ttl=60,
+        # the updates are in-memory + queued for redis - an error here is unexpected, log it with the traceback
+        try:
+            if global_max_parallel_requests is not None:
+                _key = "global_max_parallel_requests"
+                # decrement - the increment is atomic, no need to read the value first
+                await self.internal_usage_cache.async_increment_cache(
+                    key=_key,
+                    value=-1,
+                    local_only=True,
                     litellm_parent_otel_span=litellm_parent_otel_span,
-                )  # save in cache for up to 1 min.
-        except Exception as e:
-            verbose_proxy_logger.exception(
-                "Inside Parallel Request Limiter: An exception occurred - {}".format(
-                    str(e)
                 )
-            )
-
-    async def get_internal_user_object(
-        self,
-        user_id: str,
-        user_api_key_dict: UserAPIKeyAuth,
-    ) -> Optional[dict]:
-        """
-        Helper to get the 'Internal User Object'
-
-        It uses the `get_user_object` function from `litellm.proxy.auth.auth_checks`
 
-        We need this because the UserApiKeyAuth object does not contain the rpm/tpm limits for a User AND there could be a perf impact by additionally reading the UserTable.
-        """
-        from litellm._logging import verbose_proxy_logger
-        from litellm.proxy.auth.auth_checks import get_user_object
-        from litellm.proxy.proxy_server import prisma_client
-
-        try:
-            _user_id_rate_limits = await get_user_object(
-                user_id=user_id,
-                prisma_client=prisma_client,
-                user_api_key_cache=self.internal_usage_cache.dual_cache,
-                user_id_upsert=False,
-                parent_otel_span=user_api_key_dict.parent_otel_span,
-                proxy_logging_obj=None,
+            current_usage = await self._increment_local_usage(
+                increment_list=values_to_increment_in_cache,
+                parent_otel_span=litellm_parent_otel_span,
             )
-
-            if _user_id_rate_limits is None:
-                return None
-
-            return _user_id_rate_limits.model_dump()
-        except Exception as e:
             verbose_proxy_logger.debug(
-                "Parallel Request Limiter: Error getting user object", str(e)
+                "updated_value in failure call: %s", current_usage
+            )
+            self._increment_redis_usage(increment_list=values_to_increment_in_cache)
+        except Exception as e:
+            verbose_proxy_logger.exception(
+                "Inside Parallel Request Limiter: An exception occurred - %s", str(e)
             )
-            return None
 
     async def async_post_call_success_hook(
         self, data: dict, user_api_key_dict: UserAPIKeyAuth, response
@@ -826,17 +909,18 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
         Retrieve the key's remaining rate limits.
         """
         api_key = user_api_key_dict.api_key
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        current_hour = datetime.now().strftime("%H")
-        current_minute = datetime.now().strftime("%M")
-        precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+        precise_minute = _get_current_precise_minute()
         request_count_api_key = f"{api_key}::{precise_minute}::request_count"
-        current: Optional[CurrentItemRateLimit] = (
-            await self.internal_usage_cache.async_get_cache(
+        # the key's usage is the only read needed here - skip it when there are no key limits to report
+        current: Optional[CurrentItemRateLimit] = None
+        if (
+            user_api_key_dict.rpm_limit is not None
+            or user_api_key_dict.tpm_limit is not None
+        ):
+            current = await self.internal_usage_cache.async_get_cache(
                 key=request_count_api_key,
                 litellm_parent_otel_span=user_api_key_dict.parent_otel_span,
             )
-        )
 
         key_remaining_rpm_limit: Optional[int] = None
         key_rpm_limit: Optional[int] = None
@@ -854,16 +938,22 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
                 )
                 key_tpm_limit = user_api_key_dict.tpm_limit
 
-        if hasattr(response, "_hidden_params"):
-            _hidden_params = getattr(response, "_hidden_params")
-        else:
-            _hidden_params = None
-        if _hidden_params is not None and (
-            isinstance(_hidden_params, BaseModel) or isinstance(_hidden_params, dict)
+        if (
+            key_remaining_rpm_limit is None
+            and key_rpm_limit is None
+            and key_remaining_tpm_limit is None
+            and key_tpm_limit is None
         ):
-            if isinstance(_hidden_params, BaseModel):
-                _hidden_params = _hidden_params.model_dump()
+            # no rate limit headers to add
+            return await super().async_post_call_success_hook(
+                data, user_api_key_dict, response
+            )
 
+        _hidden_params = getattr(response, "_hidden_params", None)
+        if isinstance(_hidden_params, BaseModel):
+            _hidden_params = _hidden_params.model_dump()
+            setattr(response, "_hidden_params", _hidden_params)
+        if isinstance(_hidden_params, dict):
             _additional_headers = _hidden_params.get("additional_headers", {}) or {}
 
             if key_remaining_rpm_limit is not None:
@@ -879,11 +969,8 @@ class _PROXY_MaxParallelRequestsHandler(CustomLogger):
             if key_tpm_limit is not None:
                 _additional_headers["x-ratelimit-limit-tokens"] = key_tpm_limit
 
-            setattr(
-                response,
-                "_hidden_params",
-                {**_hidden_params, "additional_headers": _additional_headers},
-            )
+            # response._hidden_params is this dict - update it in place, no copy
+            _hidden_params["additional_headers"] = _additional_headers
 
             return await super().async_post_call_success_hook(
                 data, user_api_key_dict, response
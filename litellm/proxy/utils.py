@@ -88,6 +88,7 @@ from litellm.proxy.hooks.parallel_request_limiter import (
     _PROXY_MaxParallelRequestsHandler,
 )
 from litellm.secret_managers.main import str_to_bool
+from litellm.types.caching import DictIncrementOperation
 from litellm.types.integrations.slack_alerting import DEFAULT_ALERT_TYPES
 from litellm.types.utils import CallTypes, LoggedLiteLLMParams
 
@@ -217,6 +218,20 @@ class InternalUsageCache:
             **kwargs,
         )
 
+    async def async_increment_dict_pipeline(
+        self,
+        increment_list: List[DictIncrementOperation],
+        litellm_parent_otel_span: Union[Span, None],
+        local_only: bool = False,
+        **kwargs,
+    ) -> Optional[List[dict]]:
+        return await self.dual_cache.async_increment_dict_pipeline(
+            increment_list=increment_list,
+            local_only=local_only,
+            parent_otel_span=litellm_parent_otel_span,
+            **kwargs,
+        )
+
     def set_cache(
         self,
         key,
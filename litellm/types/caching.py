@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Literal, Optional, TypedDict
+from typing import Dict, Literal, Optional, TypedDict
 
 
 class LiteLLMCacheType(str, Enum):
@@ -33,3 +33,15 @@ class RedisPipelineIncrementOperation(TypedDict):
     key: str
     increment_value: float
     ttl: Optional[int]
+
+
+class DictIncrementOperation(TypedDict):
+    """
+    TypeDict for 1 increment of the counters in a dict stored at `key`
+
+    e.g. increments={"current_requests": 1} on {"current_requests": 1, "current_tpm": 10}
+    """
+
+    key: str
+    increments: Dict[str, int]
+    ttl: Optional[int]
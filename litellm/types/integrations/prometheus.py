@@ -1,42 +1,25 @@
+from typing import Final, Tuple
+
 REQUESTED_MODEL = "requested_model"
 EXCEPTION_STATUS = "exception_status"
 EXCEPTION_CLASS = "exception_class"
 EXCEPTION_LABELS = [EXCEPTION_STATUS, EXCEPTION_CLASS]
-LATENCY_BUCKETS = (
+# roughly exponential - every bucket is a series per label set, so keep the ladder short
+LATENCY_BUCKETS: Final[Tuple[float, ...]] = (
     0.005,
-    0.00625,
-    0.0125,
+    0.01,
     0.025,
     0.05,
     0.1,
+    0.25,
     0.5,
     1.0,
-    1.5,
     2.0,
-    2.5,
-    3.0,
-    3.5,
-    4.0,
-    4.5,
     5.0,
-    5.5,
-    6.0,
-    6.5,
-    7.0,
-    7.5,
-    8.0,
-    8.5,
-    9.0,
-    9.5,
     10.0,
-    15.0,
-    20.0,
-    25.0,
     30.0,
     60.0,
     120.0,
-    180.0,
-    240.0,
     300.0,
     float("inf"),
 )
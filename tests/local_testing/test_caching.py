@@ -2478,3 +2478,63 @@ async def test_redis_increment_pipeline():
     except Exception as e:
         print(f"Error occurred: {str(e)}")
         raise e
+
+
+@pytest.mark.asyncio
+async def test_redis_increment_dict_pipeline():
+    """Test Redis dict increment pipeline functionality"""
+    from litellm.caching.redis_cache import RedisCache
+
+    litellm.set_verbose = True
+    redis_cache = RedisCache(
+        host=os.environ["REDIS_HOST"],
+        port=os.environ["REDIS_PORT"],
+        password=os.environ["REDIS_PASSWORD"],
+    )
+    key = f"test_dict_key_{uuid.uuid4()}"
+
+    increment_list = [
+        {
+            "key": key,
+            "increments": {"current_requests": 1, "current_tpm": 0},
+            "ttl": 60,
+        },
+        {
+            "key": key,
+            "increments": {"current_requests": 1, "current_tpm": 10},
+            "ttl": 60,
+        },
+        {"key": key, "increments": {"current_requests": -5}, "ttl": 60},
+    ]
+
+    results = await redis_cache.async_increment_dict_pipeline(increment_list)
+
+    assert results[0] == {"current_requests": 1, "current_tpm": 0}
+    assert results[1] == {"current_requests": 2, "current_tpm": 10}
+    # counters never go below 0
+    assert results[2] == {"current_requests": 0, "current_tpm": 10}
+
+    value = await redis_cache.async_get_cache(key)
+    assert value == {"current_requests": 0, "current_tpm": 10}
+
+    await redis_cache.async_delete_cache(key)
+
+
+def test_in_memory_cache_get_cache_only_decodes_strings():
+    """Non-string values are returned as-is, json strings are still decoded"""
+    from litellm.caching.in_memory_cache import InMemoryCache
+
+    in_memory_cache = InMemoryCache()
+    counters = {"current_requests": 1, "current_tpm": 0, "current_rpm": 0}
+    in_memory_cache.set_cache("dict_key", counters)
+    in_memory_cache.set_cache("int_key", 5)
+    in_memory_cache.set_cache("json_key", '{"a": 1}')
+    in_memory_cache.set_cache("str_key", "not json")
+
+    with patch("litellm.caching.in_memory_cache.json.loads") as mock_loads:
+        assert in_memory_cache.get_cache("dict_key") is counters
+        assert in_memory_cache.get_cache("int_key") == 5
+        mock_loads.assert_not_called()
+
+    assert in_memory_cache.get_cache("json_key") == {"a": 1}
+    assert in_memory_cache.get_cache("str_key") == "not json"
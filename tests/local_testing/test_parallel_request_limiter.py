@@ -68,6 +68,110 @@ async def test_global_max_parallel_requests():
             pass
 
 
+@pytest.mark.asyncio
+async def test_global_max_parallel_requests_allows_up_to_limit():
+    """
+    Requests up to 'global_max_parallel_requests' go through, the next one is rejected
+    and does not keep the slot it took.
+    """
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key)
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    results = await asyncio.gather(
+        *[
+            parallel_request_handler.async_pre_call_hook(
+                user_api_key_dict=user_api_key_dict,
+                cache=local_cache,
+                data={"metadata": {"global_max_parallel_requests": 2}},
+                call_type="",
+            )
+            for _ in range(3)
+        ],
+        return_exceptions=True,
+    )
+
+    assert len([r for r in results if isinstance(r, Exception)]) == 1
+    assert await local_cache.async_get_cache(key="global_max_parallel_requests") == 2
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_rejected_request_releases_global_slot():
+    """
+    Test if a request rejected by a key limit gives back the global slot it took
+    """
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=1)
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    results = []
+    for _ in range(3):
+        try:
+            await parallel_request_handler.async_pre_call_hook(
+                user_api_key_dict=user_api_key_dict,
+                cache=local_cache,
+                data={"metadata": {"global_max_parallel_requests": 10}},
+                call_type="",
+            )
+            results.append(None)
+        except Exception as e:
+            results.append(e)
+
+    assert len([r for r in results if isinstance(r, Exception)]) == 2
+    assert await local_cache.async_get_cache(key="global_max_parallel_requests") == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_call_hook_releases_global_max_parallel_requests():
+    """
+    On failure, the global slot is released with a single decrement - no read of the counter first
+    """
+    from unittest.mock import patch
+
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key)
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    data = {"metadata": {"global_max_parallel_requests": 1}}
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=user_api_key_dict,
+        cache=local_cache,
+        data=data,
+        call_type="",
+    )
+    assert await local_cache.async_get_cache(key="global_max_parallel_requests") == 1
+
+    kwargs = {
+        "litellm_params": {
+            "metadata": {
+                **data["metadata"],
+                "user_api_key": _api_key,
+            }
+        },
+        "exception": Exception(),
+    }
+    with patch.object(
+        internal_usage_cache,
+        "async_get_cache",
+        side_effect=AssertionError("unexpected cache read"),
+    ):
+        await parallel_request_handler.async_log_failure_event(
+            kwargs=kwargs, response_obj="", start_time="", end_time=""
+        )
+
+    assert await local_cache.async_get_cache(key="global_max_parallel_requests") == 0
+
+
 @pytest.mark.asyncio
 async def test_pre_call_hook():
     """
@@ -321,13 +425,18 @@ async def test_pre_call_hook_user_tpm_limits():
         internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
     )
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     kwargs = {
         "litellm_params": {
-            "metadata": {"user_api_key_user_id": user_id, "user_api_key": "gm"}
+            "metadata": {
+                **data["metadata"],
+                "user_api_key_user_id": user_id,
+                "user_api_key": "gm",
+            }
         }
     }
 
@@ -368,8 +477,9 @@ async def test_success_call_hook():
         internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
     )
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -385,7 +495,9 @@ async def test_success_call_hook():
         == 1
     )
 
-    kwargs = {"litellm_params": {"metadata": {"user_api_key": _api_key}}}
+    kwargs = {
+        "litellm_params": {"metadata": {**data["metadata"], "user_api_key": _api_key}}
+    }
 
     await parallel_request_handler.async_log_success_event(
         kwargs=kwargs, response_obj="", start_time="", end_time=""
@@ -412,8 +524,9 @@ async def test_failure_call_hook():
         internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
     )
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -430,7 +543,7 @@ async def test_failure_call_hook():
     )
 
     kwargs = {
-        "litellm_params": {"metadata": {"user_api_key": _api_key}},
+        "litellm_params": {"metadata": {**data["metadata"], "user_api_key": _api_key}},
         "exception": Exception(),
     }
 
@@ -493,8 +606,9 @@ async def test_normal_router_call():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -514,7 +628,7 @@ async def test_normal_router_call():
     response = await router.acompletion(
         model="azure-model",
         messages=[{"role": "user", "content": "Hey, how's it going?"}],
-        metadata={"user_api_key": _api_key},
+        metadata={**data["metadata"], "user_api_key": _api_key},
         mock_response="hello",
     )
     await asyncio.sleep(1)  # success is done in a separate thread
@@ -574,8 +688,9 @@ async def test_normal_router_tpm_limit():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -596,7 +711,7 @@ async def test_normal_router_tpm_limit():
     response = await router.acompletion(
         model="azure-model",
         messages=[{"role": "user", "content": "Write me a paragraph on the moon"}],
-        metadata={"user_api_key": _api_key},
+        metadata={**data["metadata"], "user_api_key": _api_key},
         mock_response="hello",
     )
     await asyncio.sleep(1)  # success is done in a separate thread
@@ -654,8 +769,9 @@ async def test_streaming_router_call():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -676,7 +792,7 @@ async def test_streaming_router_call():
         model="azure-model",
         messages=[{"role": "user", "content": "Hey, how's it going?"}],
         stream=True,
-        metadata={"user_api_key": _api_key},
+        metadata={**data["metadata"], "user_api_key": _api_key},
         mock_response="hello",
     )
     async for chunk in response:
@@ -732,8 +848,9 @@ async def test_streaming_router_tpm_limit():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -754,7 +871,7 @@ async def test_streaming_router_tpm_limit():
         model="azure-model",
         messages=[{"role": "user", "content": "Write me a paragraph on the moon"}],
         stream=True,
-        metadata={"user_api_key": _api_key},
+        metadata={**data["metadata"], "user_api_key": _api_key},
         mock_response="hello",
     )
     async for chunk in response:
@@ -810,8 +927,9 @@ async def test_bad_router_call():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -833,7 +951,7 @@ async def test_bad_router_call():
             model="azure-model",
             messages=[{"role": "user2", "content": "Hey, how's it going?"}],
             stream=True,
-            metadata={"user_api_key": _api_key},
+            metadata={**data["metadata"], "user_api_key": _api_key},
         )
     except Exception:
         pass
@@ -886,8 +1004,9 @@ async def test_bad_router_tpm_limit():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     current_date = datetime.now().strftime("%Y-%m-%d")
@@ -909,7 +1028,7 @@ async def test_bad_router_tpm_limit():
             model="azure-model",
             messages=[{"role": "user2", "content": "Write me a paragraph on the moon"}],
             stream=True,
-            metadata={"user_api_key": _api_key},
+            metadata={**data["metadata"], "user_api_key": _api_key},
         )
     except Exception:
         pass
@@ -1057,8 +1176,9 @@ async def test_pre_call_hook_rpm_limits_per_model():
     print(f"litellm callbacks: {litellm.callbacks}")
     parallel_request_handler = pl.max_parallel_request_limiter
 
+    data: dict = {}
     await parallel_request_handler.async_pre_call_hook(
-        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
     )
 
     model = "azure-model"
@@ -1067,6 +1187,7 @@ async def test_pre_call_hook_rpm_limits_per_model():
         "model": model,
         "litellm_params": {
             "metadata": {
+                **data["metadata"],
                 "user_api_key": _api_key,
                 "model_group": model,
                 "user_api_key_metadata": {"model_rpm_limit": {"azure-model": 1}},
@@ -1137,10 +1258,11 @@ async def test_pre_call_hook_tpm_limits_per_model():
     parallel_request_handler = pl.max_parallel_request_limiter
     model = "azure-model"
 
+    data: dict = {"model": model}
     await parallel_request_handler.async_pre_call_hook(
         user_api_key_dict=user_api_key_dict,
         cache=local_cache,
-        data={"model": model},
+        data=data,
         call_type="",
     )
 
@@ -1148,6 +1270,7 @@ async def test_pre_call_hook_tpm_limits_per_model():
         "model": model,
         "litellm_params": {
             "metadata": {
+                **data["metadata"],
                 "user_api_key": _api_key,
                 "model_group": model,
                 "user_api_key_metadata": {
@@ -1300,3 +1423,817 @@ async def test_post_call_success_hook_rpm_limits_per_model():
     assert "x-ratelimit-remaining-requests" in hidden_params["additional_headers"]
     assert "x-ratelimit-limit-tokens" in hidden_params["additional_headers"]
     assert "x-ratelimit-remaining-tokens" in hidden_params["additional_headers"]
+
+
+@pytest.mark.asyncio
+async def test_post_call_success_hook_no_key_limits_skips_cache_read():
+    """
+    Test if the remaining limits aren't read from cache when the key has no rpm / tpm limit
+    """
+    from unittest.mock import patch
+
+    from litellm import ModelResponse
+
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=10)
+    internal_usage_cache = InternalUsageCache(dual_cache=DualCache())
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    response = ModelResponse()
+    hidden_params = {"model_id": "1234"}
+    setattr(response, "_hidden_params", hidden_params)
+    with patch.object(internal_usage_cache, "async_get_cache") as mock_get_cache:
+        await parallel_request_handler.async_post_call_success_hook(
+            data={}, user_api_key_dict=user_api_key_dict, response=response
+        )
+        mock_get_cache.assert_not_called()
+
+    # no limits -> _hidden_params is left untouched
+    assert getattr(response, "_hidden_params") == {"model_id": "1234"}
+
+
+@pytest.mark.asyncio
+async def test_post_call_success_hook_updates_hidden_params_in_place():
+    """
+    Test if the rate limit headers are added to the response's existing _hidden_params dict
+    """
+    from litellm import ModelResponse
+
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, rpm_limit=10)
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data={}, call_type=""
+    )
+
+    response = ModelResponse()
+    hidden_params = {"model_id": "1234"}
+    setattr(response, "_hidden_params", hidden_params)
+    await parallel_request_handler.async_post_call_success_hook(
+        data={}, user_api_key_dict=user_api_key_dict, response=response
+    )
+
+    assert getattr(response, "_hidden_params") is hidden_params
+    assert hidden_params["model_id"] == "1234"
+    assert hidden_params["additional_headers"]["x-ratelimit-limit-requests"] == 10
+    assert hidden_params["additional_headers"]["x-ratelimit-remaining-requests"] == 10
+
+
+@pytest.mark.asyncio
+async def test_success_call_hook_increments_without_cache_reads():
+    """
+    Test if on success, the usage for all scopes is updated with increments, without reading it first
+    """
+    from unittest.mock import patch
+
+    _api_key = hash_token("sk-12345")
+    _user_id = "unique-user-id"
+    _team_id = "unique-team-id"
+    user_api_key_dict = UserAPIKeyAuth(
+        api_key=_api_key,
+        max_parallel_requests=10,
+        user_id=_user_id,
+        team_id=_team_id,
+    )
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    data: dict = {}
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
+    )
+    await asyncio.sleep(1)
+
+    kwargs = {
+        "litellm_params": {
+            "metadata": {
+                **data["metadata"],
+                "user_api_key": _api_key,
+                "user_api_key_user_id": _user_id,
+                "user_api_key_team_id": _team_id,
+            }
+        }
+    }
+
+    with patch.object(
+        internal_usage_cache,
+        "async_batch_get_cache",
+        wraps=internal_usage_cache.async_batch_get_cache,
+    ) as mock_batch_get, patch.object(
+        internal_usage_cache,
+        "async_get_cache",
+        wraps=internal_usage_cache.async_get_cache,
+    ) as mock_get:
+        await parallel_request_handler.async_log_success_event(
+            kwargs=kwargs,
+            response_obj=litellm.ModelResponse(usage=litellm.Usage(total_tokens=10)),
+            start_time="",
+            end_time="",
+        )
+
+        mock_batch_get.assert_not_called()
+        mock_get.assert_not_called()
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    for _id in [_api_key, _user_id, _team_id]:
+        current = internal_usage_cache.get_cache(
+            key=f"{_id}::{precise_minute}::request_count"
+        )
+        assert current["current_requests"] == 0
+        assert current["current_tpm"] == 10
+        assert current["current_rpm"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_concurrent_requests():
+    """
+    Test if concurrent requests don't overwrite each other's increments
+    """
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=100)
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    await asyncio.gather(
+        *[
+            parallel_request_handler.async_pre_call_hook(
+                user_api_key_dict=user_api_key_dict,
+                cache=local_cache,
+                data={},
+                call_type="",
+            )
+            for _ in range(10)
+        ]
+    )
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    request_count_api_key = f"{_api_key}::{precise_minute}::request_count"
+    assert (
+        parallel_request_handler.internal_usage_cache.get_cache(
+            key=request_count_api_key
+        )["current_requests"]
+        == 10
+    )
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_concurrent_requests_over_limit():
+    """
+    Test if concurrent requests can't exceed max_parallel_requests, and rejected requests don't take a slot
+    """
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=3)
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    results = await asyncio.gather(
+        *[
+            parallel_request_handler.async_pre_call_hook(
+                user_api_key_dict=user_api_key_dict,
+                cache=local_cache,
+                data={},
+                call_type="",
+            )
+            for _ in range(10)
+        ],
+        return_exceptions=True,
+    )
+
+    rejected = [r for r in results if isinstance(r, Exception)]
+    assert len(rejected) == 7
+    assert all(r.status_code == 429 for r in rejected)
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    request_count_api_key = f"{_api_key}::{precise_minute}::request_count"
+    assert (
+        parallel_request_handler.internal_usage_cache.get_cache(
+            key=request_count_api_key
+        )["current_requests"]
+        == 3
+    )
+
+
+def test_get_precise_minute():
+    """
+    Test if the minute bucket matches the strftime format used in the cache keys
+    """
+    from litellm.proxy.hooks.parallel_request_limiter import _get_precise_minute
+
+    for now in [datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 12, 31, 23, 59, 59)]:
+        assert _get_precise_minute(now) == now.strftime("%Y-%m-%d-%H-%M")
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_no_limits_skips_cache():
+    """
+    Test if the cache isn't touched when the key has no limits to check
+    """
+    from unittest.mock import patch
+
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key)
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    with patch.object(
+        internal_usage_cache, "async_batch_get_cache"
+    ) as mock_batch_get, patch.object(
+        internal_usage_cache, "async_increment_dict_pipeline"
+    ) as mock_increment:
+        await parallel_request_handler.async_pre_call_hook(
+            user_api_key_dict=user_api_key_dict,
+            cache=local_cache,
+            data={},
+            call_type="",
+        )
+
+        mock_batch_get.assert_not_called()
+        mock_increment.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_redis_increments_are_batched():
+    """
+    Test if increments queued within 1 batch window are pushed to redis in 1 pipeline, merged by key
+    """
+    from unittest.mock import AsyncMock, MagicMock
+
+    from litellm.types.caching import DictIncrementOperation
+
+    local_cache = DualCache()
+    local_cache.redis_cache = MagicMock()
+    local_cache.redis_cache.async_increment_dict_pipeline = AsyncMock()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    for _ in range(3):
+        parallel_request_handler._increment_redis_usage(
+            increment_list=[
+                DictIncrementOperation(
+                    key="test-key", increments={"current_requests": 1}, ttl=60
+                ),
+                DictIncrementOperation(
+                    key="test-key-2", increments={"current_requests": 1}, ttl=60
+                ),
+            ]
+        )
+
+    await asyncio.sleep(0.1)
+
+    mock_increment = local_cache.redis_cache.async_increment_dict_pipeline
+    mock_increment.assert_called_once()
+    increment_list = mock_increment.call_args.kwargs["increment_list"]
+    assert len(increment_list) == 2
+    assert all(op["increments"]["current_requests"] == 3 for op in increment_list)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_usage_synced_with_redis():
+    """
+    Test if after a push to redis, the in-memory usage is the redis usage (incl. other instances) + still queued increments
+    """
+    from litellm.types.caching import DictIncrementOperation
+
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+    parallel_request_handler.redis_increment_operation_queue = [
+        DictIncrementOperation(
+            key="test-key", increments={"current_requests": 1}, ttl=60
+        )
+    ]
+
+    parallel_request_handler._sync_in_memory_usage_with_redis(
+        increment_list=[
+            DictIncrementOperation(
+                key="test-key", increments={"current_requests": 1}, ttl=60
+            )
+        ],
+        redis_values=[{"current_requests": 5, "current_tpm": 100, "current_rpm": 3}],
+    )
+
+    assert local_cache.in_memory_cache.get_cache(key="test-key") == {
+        "current_requests": 6,
+        "current_tpm": 100,
+        "current_rpm": 3,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_concurrent_requests_with_redis_bucket():
+    """
+    Test if concurrent requests for a bucket that's only in redis can't all take the last slot -
+    loading the bucket from redis doesn't overwrite the increments made during the redis read
+    """
+    from unittest.mock import AsyncMock, MagicMock
+
+    from litellm.proxy.hooks.parallel_request_limiter import (
+        _get_current_precise_minute,
+    )
+
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=1)
+
+    async def _redis_batch_get_cache(key_list, parent_otel_span=None):
+        await asyncio.sleep(0.01)
+        return {
+            key: {"current_requests": 0, "current_tpm": 0, "current_rpm": 0}
+            for key in key_list
+        }
+
+    local_cache = DualCache()
+    local_cache.redis_cache = MagicMock()
+    local_cache.redis_cache.async_batch_get_cache = AsyncMock(
+        side_effect=_redis_batch_get_cache
+    )
+    local_cache.redis_cache.async_increment_dict_pipeline = AsyncMock(
+        return_value=[{"current_requests": 1, "current_tpm": 0, "current_rpm": 0}]
+    )
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    results = await asyncio.gather(
+        *[
+            parallel_request_handler.async_pre_call_hook(
+                user_api_key_dict=user_api_key_dict,
+                cache=local_cache,
+                data={},
+                call_type="",
+            )
+            for _ in range(3)
+        ],
+        return_exceptions=True,
+    )
+
+    assert len([r for r in results if isinstance(r, Exception)]) == 2
+    request_count_api_key = (
+        f"{_api_key}::{_get_current_precise_minute()}::request_count"
+    )
+    assert (
+        local_cache.in_memory_cache.get_cache(key=request_count_api_key)[
+            "current_requests"
+        ]
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_limits_added_to_key_apply_immediately():
+    """
+    Test if a key that had no limits is rate limited on the next request, once limits are added to it
+    """
+    _api_key = hash_token("sk-12345")
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=UserAPIKeyAuth(api_key=_api_key),
+        cache=local_cache,
+        data={},
+        call_type="",
+    )
+
+    with pytest.raises(Exception) as e:
+        await parallel_request_handler.async_pre_call_hook(
+            user_api_key_dict=UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=0),
+            cache=local_cache,
+            data={},
+            call_type="",
+        )
+    assert e.value.status_code == 429
+
+
+def test_get_current_precise_minute():
+    """
+    Test if the minute bucket built from the minute index matches the one built from datetime.now()
+    """
+    from litellm.proxy.hooks.parallel_request_limiter import (
+        _get_current_precise_minute,
+        _get_precise_minute_for_index,
+    )
+
+    now = datetime.now()
+    assert _get_precise_minute_for_index(int(now.timestamp()) // 60) == now.strftime(
+        "%Y-%m-%d-%H-%M"
+    )
+    assert len(_get_current_precise_minute()) == len("2024-01-01-00-00")
+
+
+@pytest.mark.asyncio
+async def test_success_call_hook_request_started_in_earlier_minute():
+    """
+    Test if on success, the slot is released in the minute the request was counted in,
+    and the tokens are counted in the current minute
+    """
+    _api_key = hash_token("sk-12345")
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    data = {"metadata": {}}
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=10),
+        cache=local_cache,
+        data=data,
+        call_type="",
+    )
+    request_precise_minute = data["metadata"]["rate_limit_precise_minute"]
+
+    # simulate the request completing in a later minute
+    earlier_precise_minute = "2024-01-01-00-00"
+    internal_usage_cache.set_cache(
+        key=f"{_api_key}::{earlier_precise_minute}::request_count",
+        value=internal_usage_cache.get_cache(
+            key=f"{_api_key}::{request_precise_minute}::request_count"
+        ),
+    )
+    internal_usage_cache.set_cache(
+        key=f"{_api_key}::{request_precise_minute}::request_count",
+        value={"current_requests": 0, "current_tpm": 0, "current_rpm": 0},
+    )
+
+    await parallel_request_handler.async_log_success_event(
+        kwargs={
+            "litellm_params": {
+                "metadata": {
+                    "user_api_key": _api_key,
+                    "rate_limit_precise_minute": earlier_precise_minute,
+                }
+            }
+        },
+        response_obj=litellm.ModelResponse(usage=litellm.Usage(total_tokens=10)),
+        start_time="",
+        end_time="",
+    )
+
+    assert (
+        internal_usage_cache.get_cache(
+            key=f"{_api_key}::{earlier_precise_minute}::request_count"
+        )["current_requests"]
+        == 0
+    )
+    current = internal_usage_cache.get_cache(
+        key=f"{_api_key}::{request_precise_minute}::request_count"
+    )
+    assert current["current_tpm"] == 10
+    assert current["current_rpm"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_call_hook_releases_all_scopes():
+    """
+    Test if on failure, the request's slot is released for the api key, user and team
+    """
+    _api_key = hash_token("sk-12345")
+    _user_id = "unique-user-id"
+    _team_id = "unique-team-id"
+    user_api_key_dict = UserAPIKeyAuth(
+        api_key=_api_key,
+        max_parallel_requests=10,
+        user_id=_user_id,
+        team_id=_team_id,
+    )
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    data: dict = {}
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
+    )
+
+    kwargs = {
+        "litellm_params": {
+            "metadata": {
+                **data["metadata"],
+                "user_api_key": _api_key,
+                "user_api_key_user_id": _user_id,
+                "user_api_key_team_id": _team_id,
+            }
+        },
+        "exception": Exception(),
+    }
+    await parallel_request_handler.async_log_failure_event(
+        kwargs=kwargs, response_obj="", start_time="", end_time=""
+    )
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    for _id in [_api_key, _user_id, _team_id]:
+        current = internal_usage_cache.get_cache(
+            key=f"{_id}::{precise_minute}::request_count"
+        )
+        assert current["current_requests"] == 0
+        assert current["current_tpm"] == 0
+        assert current["current_rpm"] == 0
+
+
+@pytest.mark.asyncio
+async def test_success_and_failure_call_hook_skip_requests_not_rate_limited():
+    """
+    A key with no limits isn't counted by the pre-call hook, so the success / failure hooks don't update its usage either
+    """
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key)
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    data: dict = {}
+    await parallel_request_handler.async_pre_call_hook(
+        user_api_key_dict=user_api_key_dict, cache=local_cache, data=data, call_type=""
+    )
+    assert "rate_limit_precise_minute" not in data.get("metadata", {})
+
+    kwargs = {
+        "litellm_params": {
+            "metadata": {**data.get("metadata", {}), "user_api_key": _api_key}
+        },
+    }
+    await parallel_request_handler.async_log_success_event(
+        kwargs=kwargs,
+        response_obj=litellm.ModelResponse(usage=litellm.Usage(total_tokens=10)),
+        start_time="",
+        end_time="",
+    )
+    await parallel_request_handler.async_log_failure_event(
+        kwargs={**kwargs, "exception": Exception()},
+        response_obj="",
+        start_time="",
+        end_time="",
+    )
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    assert (
+        internal_usage_cache.get_cache(
+            key=f"{_api_key}::{precise_minute}::request_count"
+        )
+        is None
+    )
+    assert parallel_request_handler.redis_increment_operation_queue == []
+
+
+@pytest.mark.asyncio
+async def test_pass_through_request_releases_slot_and_keeps_provider_body():
+    """
+    On pass-through routes the request body is sent to the provider as-is.
+
+    The pre-call hook must not add keys to the provider's `metadata`, and the success hook must still release the slot
+    """
+    from unittest.mock import MagicMock
+
+    from litellm.proxy.pass_through_endpoints.pass_through_endpoints import (
+        _init_kwargs_for_pass_through_endpoint,
+    )
+    from litellm.proxy.pass_through_endpoints.types import (
+        PassthroughStandardLoggingPayload,
+    )
+
+    _api_key = hash_token("sk-12345")
+    user_api_key_dict = UserAPIKeyAuth(api_key=_api_key, max_parallel_requests=1)
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    for _ in range(2):
+        # vertex-style body - `metadata` belongs to the provider
+        _parsed_body = {
+            "contents": [{"role": "user", "parts": [{"text": "hi"}]}],
+            "metadata": {"labels": {"team": "a"}},
+        }
+        await parallel_request_handler.async_pre_call_hook(
+            user_api_key_dict=user_api_key_dict,
+            cache=local_cache,
+            data=_parsed_body,
+            call_type="pass_through_endpoint",
+        )
+        request = MagicMock()
+        request.headers = {}
+        kwargs = _init_kwargs_for_pass_through_endpoint(
+            request=request,
+            user_api_key_dict=user_api_key_dict,
+            passthrough_logging_payload=PassthroughStandardLoggingPayload(
+                url="https://example.com", request_body=_parsed_body
+            ),
+            _parsed_body=_parsed_body,
+        )
+
+        # body sent to the provider is unchanged
+        assert _parsed_body == {
+            "contents": [{"role": "user", "parts": [{"text": "hi"}]}],
+            "metadata": {"labels": {"team": "a"}},
+        }
+
+        await parallel_request_handler.async_log_success_event(
+            kwargs=kwargs,
+            response_obj=litellm.ModelResponse(usage=litellm.Usage(total_tokens=10)),
+            start_time="",
+            end_time="",
+        )
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    current = internal_usage_cache.get_cache(
+        key=f"{_api_key}::{precise_minute}::request_count"
+    )
+    assert current["current_requests"] == 0
+    assert current["current_rpm"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_call_hook_decrement_never_goes_below_zero():
+    """
+    The failure hook releases the slot with 1 atomic decrement per key - no read of the counter first,
+    and a missing / expired bucket doesn't go negative
+    """
+    from unittest.mock import patch
+
+    _api_key = hash_token("sk-12345")
+    local_cache = DualCache()
+    internal_usage_cache = InternalUsageCache(dual_cache=local_cache)
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=internal_usage_cache
+    )
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+
+    # bucket for the minute the request was admitted in has expired / was never loaded
+    kwargs = {
+        "litellm_params": {
+            "metadata": {
+                "user_api_key": _api_key,
+                "rate_limit_precise_minute": precise_minute,
+            }
+        },
+        "exception": Exception(),
+    }
+    with patch.object(
+        internal_usage_cache,
+        "async_get_cache",
+        side_effect=AssertionError("unexpected cache read"),
+    ), patch.object(
+        internal_usage_cache,
+        "async_batch_get_cache",
+        side_effect=AssertionError("unexpected cache read"),
+    ):
+        await parallel_request_handler.async_log_failure_event(
+            kwargs=kwargs, response_obj="", start_time="", end_time=""
+        )
+
+    current = internal_usage_cache.get_cache(
+        key=f"{_api_key}::{precise_minute}::request_count"
+    )
+    assert current["current_requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pre_call_hook_skips_model_bucket_for_model_without_limit():
+    """
+    A key with per-model limits doesn't track a model + API Key bucket for models it has no limit for
+    """
+    _api_key = hash_token("sk-12345")
+    model_rpm_limit = {"azure-model": 1}
+    user_api_key_dict = UserAPIKeyAuth(
+        api_key=_api_key, metadata={"model_rpm_limit": model_rpm_limit}
+    )
+    local_cache = DualCache()
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=local_cache)
+    )
+
+    for _ in range(2):
+        data = {"model": "gpt-4o", "metadata": {}}
+        await parallel_request_handler.async_pre_call_hook(
+            user_api_key_dict=user_api_key_dict,
+            cache=local_cache,
+            data=data,
+            call_type="",
+        )
+        assert "litellm-key-remaining-requests-gpt-4o" not in data["metadata"]
+
+        await parallel_request_handler.async_log_success_event(
+            kwargs={
+                "model": "gpt-4o",
+                "litellm_params": {
+                    "metadata": {
+                        "user_api_key": _api_key,
+                        "model_group": "gpt-4o",
+                        "user_api_key_metadata": {"model_rpm_limit": model_rpm_limit},
+                    },
+                },
+            },
+            response_obj="",
+            start_time="",
+            end_time="",
+        )
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    current_hour = datetime.now().strftime("%H")
+    current_minute = datetime.now().strftime("%M")
+    precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+    assert (
+        local_cache.get_cache(
+            key=f"{_api_key}::gpt-4o::{precise_minute}::request_count"
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_failure_call_hook_missing_params_is_not_an_error():
+    """
+    Test if a failure event without litellm_params / exception is skipped, without logging an exception
+    """
+    from unittest.mock import patch
+
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=DualCache())
+    )
+
+    with patch(
+        "litellm.proxy.hooks.parallel_request_limiter.verbose_proxy_logger.exception"
+    ) as mock_exception:
+        await parallel_request_handler.async_log_failure_event(
+            kwargs={}, response_obj="", start_time="", end_time=""
+        )
+        await parallel_request_handler.async_log_failure_event(
+            kwargs={"litellm_params": {"metadata": {"user_api_key": "sk-1234"}}},
+            response_obj="",
+            start_time="",
+            end_time="",
+        )
+        mock_exception.assert_not_called()
+
+
+def test_batch_window_ms_from_litellm_settings(monkeypatch):
+    """
+    Test if the redis batch window can be set with `litellm.rate_limit_redis_batch_window_ms`, after the handler is created
+    """
+    from litellm.proxy.hooks.parallel_request_limiter import (
+        DEFAULT_REDIS_BATCH_WINDOW_MS,
+    )
+
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=DualCache())
+    )
+    assert parallel_request_handler._get_batch_window_ms() == (
+        DEFAULT_REDIS_BATCH_WINDOW_MS
+    )
+
+    monkeypatch.setattr(litellm, "rate_limit_redis_batch_window_ms", 50)
+    assert parallel_request_handler._get_batch_window_ms() == 50
+
+    # set on the handler -> takes precedence
+    parallel_request_handler = MaxParallelRequestsHandler(
+        internal_usage_cache=InternalUsageCache(dual_cache=DualCache()),
+        batch_window_ms=10,
+    )
+    assert parallel_request_handler._get_batch_window_ms() == 10
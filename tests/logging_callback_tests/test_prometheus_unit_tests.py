@@ -774,3 +774,15 @@ def test_increment_deployment_cooled_down(prometheus_logger):
         "gpt-3.5-turbo", "model-123", "https://api.openai.com", "openai", "429"
     )
     prometheus_logger.litellm_deployment_cooled_down.labels().inc.assert_called_once()
+
+
+def test_latency_buckets_are_sorted_and_unique():
+    """
+    Test if LATENCY_BUCKETS is strictly increasing and ends with +Inf
+    """
+    from litellm.types.integrations.prometheus import LATENCY_BUCKETS
+
+    assert all(
+        lower < upper for lower, upper in zip(LATENCY_BUCKETS, LATENCY_BUCKETS[1:])
+    )
+    assert LATENCY_BUCKETS[-1] == float("inf")